@@ -1,15 +1,124 @@
+import hashlib
 import logging
+import os
 import random
+import re
 from datetime import datetime
-from typing import List, Dict
+from typing import AsyncIterator, ClassVar, List, Dict, Optional, Tuple
+import asyncio
 import aiohttp
+import diskcache
+import orjson
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from dataclasses import dataclass
 from enum import Enum
 from rich.console import Console
 from rich.markdown import Markdown
 import ssl
+import textwrap
 import certifi
-ssl_context = ssl.create_default_context(cafile=certifi.where())
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    # Built on first use so importing the module doesn't parse the CA bundle
+    return ssl.create_default_context(cafile=certifi.where())
+
+RESPONSE_CACHE_DIR = os.path.expanduser("~/.cache/devops_posts")
+RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days
+# Matches ContentReviewer's "too long" threshold; longer streams are cut short
+MAX_STREAM_WORDS = 400
+
+OPENAI_TIMEOUT = aiohttp.ClientTimeout(total=60, connect=10, sock_read=30)
+_backoff = wait_exponential(min=1, max=10)
+
+
+def _is_retryable(error: BaseException) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+def _wait_retry_after(retry_state) -> float:
+    # Prefer the server's Retry-After on 429, otherwise back off exponentially
+    error = retry_state.outcome.exception()
+    if isinstance(error, aiohttp.ClientResponseError) and error.status == 429 and error.headers:
+        retry_after = error.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), 60.0)
+    return _backoff(retry_state)
+
+# Precompiled reviewer patterns; matched against lowercased content
+_CTA_RE = re.compile(r"let me know|what do you think|share your|comment below")
+TECH_TERMS = ("devops", "python", "cloud", "kubernetes", "docker", "ci/cd",
+              "automation", "infrastructure", "deployment", "pipeline")
+# Single-pass multi-term matcher (leftmost, non-overlapping matches); longest terms first for determinism
+_TECH_RE = re.compile("|".join(re.escape(t) for t in sorted(TECH_TERMS, key=len, reverse=True)))
+_EMOJI_RE = re.compile(r"[^\x00-\x7F]")
+_SENTENCE_RE = re.compile(r"[.!?]+")
+
+# Prompt templates, rendered with a single str.format per call
+_TECH_TIP_TEMPLATE = """Write a LinkedIn post about a useful {tool} tip or trick that DevOps engineers should know.
+Requirements:
+- Start with a hook that grabs attention
+- Provide practical, actionable advice
+- Include a brief code snippet or command if relevant
+- Keep it under 300 words
+- End with a question to encourage engagement
+- Write in first person, conversational tone
+- Don't include hashtags (they'll be added separately)
+Make it feel authentic and based on real experience."""
+
+_PROBLEM_SOLUTION_TEMPLATE = """Write a LinkedIn post about solving a {challenge} challenge in DevOps.
+Requirements:
+- Start with the problem statement
+- Describe the impact of the problem
+- Present your solution approach
+- Share the outcome or results
+- Keep it under 300 words
+- Write in first person, sharing a real experience feel
+- Include emoji where appropriate for readability
+- Don't include hashtags"""
+
+_TOOL_DISCOVERY_PROMPT = """Write a LinkedIn post about discovering or trying a new DevOps tool or technology.
+Requirements:
+- Share excitement about the discovery
+- Explain what the tool does
+- Mention specific use cases
+- Compare briefly with alternatives if relevant
+- Keep it under 300 words
+- Write enthusiastically but authentically
+- Don't include hashtags"""
+
+_BEST_PRACTICE_TEMPLATE = """Write a LinkedIn post about a {concept} best practice.
+Requirements:
+- Share a specific best practice
+- Explain why it matters
+- Provide a real-world example
+- Mention common mistakes to avoid
+- Keep it under 300 words
+- Write in an educational but not preachy tone
+- Don't include hashtags"""
+
+_INDUSTRY_NEWS_TEMPLATE = """Write a LinkedIn post sharing thoughts on {trend} in the DevOps space.
+Requirements:
+- Start with an observation or recent development
+- Share your perspective on why it matters
+- Discuss potential impact on the industry
+- Keep it under 300 words
+- Write thoughtfully and forward-looking
+- Don't include hashtags"""
+
+_PERSONAL_INSIGHT_PROMPT = """Write a LinkedIn post sharing a personal insight or lesson learned as a DevOps engineer.
+Requirements:
+- Share a genuine learning moment
+- Be vulnerable about mistakes or challenges
+- Explain what you learned
+- How it changed your approach
+- Keep it under 300 words
+- Write authentically and personally
+- Don't include hashtags"""
 
 class ContentType(Enum):
     TECHNICAL_TIP = "technical_tip"
@@ -28,149 +137,353 @@ class LinkedInPost:
     status: str = "pending"
 
 class DevOpsContentGenerator:
-    def __init__(self, api_key: str, model: str = "gpt-4"):
+    # Static system prefix. Kept byte-identical across calls (and above OpenAI's
+    # 1024-token threshold) so repeated requests hit the automatic prompt cache.
+    _SYSTEM_PROMPT = textwrap.dedent("""
+        You are an experienced DevOps Engineer and Python Developer with deep expertise in cloud automation (AWS, Azure), CI/CD pipeline development (Jenkins, GitHub Actions, ArgoCD), Infrastructure-as-Code (Terraform, AWS CDK), Kubernetes (EKS, Helm), and system monitoring (Prometheus, ELK Stack). Your goal is to write engaging, insightful, and technically accurate LinkedIn posts that share industry best practices, real-world challenges, useful tips, and personal achievements in DevOps and Cloud Engineering. Posts should be professional yet approachable, concise, and inspire discussions. Target an audience of developers, DevOps engineers, and cloud architects.
+
+        Style guide:
+        - Open with a single-sentence hook that states a concrete observation, number, or surprise. Never open with "In today's fast-paced world" or similar filler.
+        - Use short paragraphs of one to three sentences separated by blank lines so the post reads well on mobile.
+        - Prefer specific tools, commands, versions, and metrics over generic statements. "We cut build time from 14 to 6 minutes" beats "we improved performance".
+        - When you include a command or code snippet, keep it under eight lines, make it copy-pasteable, and explain what it does in one sentence.
+        - Use emoji sparingly as visual anchors for lists or key points, at most one per paragraph.
+        - Write in first person and keep the tone conversational, humble, and practical. Share trade-offs and what did not work, not only successes.
+        - Avoid marketing language, buzzword stacking, and unverifiable claims. Do not invent statistics, customers, or product features.
+        - Stay between 120 and 300 words unless the request says otherwise.
+        - Finish with a genuine open question that invites readers to share their own experience.
+        - Never include hashtags; they are appended separately.
+
+        Example post 1 (technical tip):
+        Most Kubernetes outages I've debugged started with a pod that looked healthy but wasn't.
+
+        The culprit? Liveness and readiness probes pointing at the same endpoint.
+
+        When the database gets slow, the readiness check fails (good, traffic stops), but so does liveness, and the kubelet restarts every replica at once. Now a slow dependency has turned into a full outage.
+
+        What I do now:
+        🔹 Readiness checks dependencies: "can I serve traffic right now?"
+        🔹 Liveness checks only the process itself: "am I deadlocked?"
+        🔹 A startupProbe covers slow boots so liveness doesn't kill them early
+
+        kubectl get pods -o jsonpath='{.items[*].spec.containers[*].livenessProbe.httpGet.path}'
+
+        Run that across your namespaces. If it prints the same path as your readiness probe, you have a cascading restart waiting to happen.
+
+        How do you structure health checks in your clusters?
+
+        Example post 2 (lesson learned):
+        Last year I deleted a production Terraform state lock by hand. It did not go well.
+
+        A pipeline had crashed mid-apply and left the DynamoDB lock behind. I was in a hurry, so I force-unlocked it without checking whether another run was still active. It was. Two applies raced, and we spent the afternoon reconciling drifted security groups.
+
+        What changed afterwards:
+        ✅ Every pipeline run writes its run ID into the lock metadata
+        ✅ force-unlock requires a second approver in our runbook
+        ✅ We moved to smaller state files per service, so one stuck lock blocks less
+
+        The technical fix took an hour. The process fix took a month of conversations, and it mattered more.
+
+        Automation doesn't remove the need for guardrails; it just moves them earlier in the pipeline.
+
+        What's the most expensive "quick fix" you've learned from?
+
+        Example post 3 (best practice):
+        Your CI pipeline is only as fast as its slowest cache miss.
+
+        We had a GitHub Actions workflow that took 18 minutes on every pull request. Profiling it showed 11 of those minutes were spent reinstalling Python dependencies that had not changed in weeks.
+
+        Three changes brought it down to 7 minutes:
+        ⚡ Cache keyed on the hash of requirements.txt, not on the branch name
+        ⚡ Docker layer caching with a registry backend instead of the local runner
+        ⚡ Splitting unit and integration tests into parallel jobs
+
+        The lesson is that pipeline performance is an observability problem first. Measure each step before you optimize any of them, because the slow part is rarely where you expect it.
+
+        Which step in your pipeline would you profile first?
+
+        Example post 4 (industry perspective):
+        Platform engineering is not a rebrand of DevOps. It's what happens when DevOps succeeds and then has to scale.
+
+        Five years ago our team owned every Jenkins job, Terraform module, and Helm chart in the company. Each new service meant another ticket in our queue. We were the bottleneck we had promised to remove.
+
+        Building an internal platform changed the question from "can you deploy this for me?" to "which golden path fits my service?":
+        🧭 Templates for new services with CI, observability, and alerts wired in from day one
+        🧭 Self-service environments through a small API instead of a ticket
+        🧭 Guardrails expressed as policy-as-code rather than manual reviews
+
+        The hard part wasn't the tooling. It was treating developers as customers, running user interviews, and deleting features nobody used.
+
+        Is your team building a platform, or still running a ticket queue with extra steps?
+    """).strip()
+
+    # Topic and hashtag pools are shared, immutable class constants
+    _TOOLS: ClassVar[Tuple[str, ...]] = (
+        "Kubernetes", "Docker", "Terraform", "Ansible", "Jenkins",
+        "GitLab CI", "GitHub Actions", "ArgoCD", "Prometheus", "Grafana"
+    )
+    _CONCEPTS: ClassVar[Tuple[str, ...]] = (
+        "CI/CD", "Infrastructure as Code", "GitOps", "Service Mesh",
+        "Observability", "Chaos Engineering", "SRE", "Platform Engineering"
+    )
+    _CHALLENGES: ClassVar[Tuple[str, ...]] = (
+        "scaling", "monitoring", "security", "cost optimization",
+        "deployment failures", "debugging", "performance tuning"
+    )
+    _TRENDS: ClassVar[Tuple[str, ...]] = (
+        "AI in DevOps", "FinOps", "Platform Engineering", "Green Computing",
+        "Edge Computing", "Serverless", "WebAssembly"
+    )
+    _HASHTAG_POOL: ClassVar[Tuple[str, ...]] = (
+        "#DevOps", "#Python", "#CloudComputing", "#Kubernetes", "#Docker",
+        "#CI/CD", "#InfrastructureAsCode", "#SRE", "#PlatformEngineering",
+        "#TechTips", "#CloudNative", "#Automation", "#DevOpsLife"
+    )
+
+    def __init__(self, api_key: str, model: str = "gpt-4", use_cache_control: bool = False,
+                 force_refresh: bool = False, cache_dir: Optional[str] = None):
         self.api_key = api_key
         self.model = model
-        self.base_url = "https://api.openai.com/v1/chat/completions"
-        self.topics = {
-            "tools": ["Kubernetes", "Docker", "Terraform", "Ansible", "Jenkins", 
-                     "GitLab CI", "GitHub Actions", "ArgoCD", "Prometheus", "Grafana"],
-            "concepts": ["CI/CD", "Infrastructure as Code", "GitOps", "Service Mesh",
-                        "Observability", "Chaos Engineering", "SRE", "Platform Engineering"],
-            "challenges": ["scaling", "monitoring", "security", "cost optimization",
-                          "deployment failures", "debugging", "performance tuning"],
-            "trends": ["AI in DevOps", "FinOps", "Platform Engineering", "Green Computing",
-                      "Edge Computing", "Serverless", "WebAssembly"]
+        self.use_cache_control = use_cache_control
+        self.force_refresh = force_refresh
+        # Opt-in store of approved posts that weren't published, e.g. cache_dir=RESPONSE_CACHE_DIR
+        self._cache = diskcache.Cache(cache_dir) if cache_dir else None
+        self.api_base = "https://api.openai.com/v1"
+        self.base_url = f"{self.api_base}/chat/completions"
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._hashtag_cache = self._build_hashtag_cache()
+        # Only the chosen builder runs, so unused prompts aren't rendered per call
+        self.prompt_builders = {
+            ContentType.TECHNICAL_TIP: self._get_technical_tip_prompt,
+            ContentType.PROBLEM_SOLUTION: self._get_problem_solution_prompt,
+            ContentType.TOOL_DISCOVERY: self._get_tool_discovery_prompt,
+            ContentType.BEST_PRACTICE: self._get_best_practice_prompt,
+            ContentType.INDUSTRY_NEWS: self._get_industry_news_prompt,
+            ContentType.PERSONAL_INSIGHT: self._get_personal_insight_prompt
         }
-        self.hashtag_pool = [
-            "#DevOps", "#Python", "#CloudComputing", "#Kubernetes", "#Docker",
-            "#CI/CD", "#InfrastructureAsCode", "#SRE", "#PlatformEngineering",
-            "#TechTips", "#CloudNative", "#Automation", "#DevOpsLife"
-        ]
         logging.info("DevOpsContentGenerator initialized.")
 
-    async def generate_content_ideas(self) -> Dict:
+    async def generate_content_ideas(self, now: Optional[datetime] = None) -> Dict:
         content_types = list(ContentType)
         content_type = random.choice(content_types)
-        logging.info(f"Generating content idea for type: {content_type.value}")
-        idea = await self._create_content_idea(content_type)
+        logging.info("Generating content idea for type: %s", content_type.value)
+        idea = await self._create_content_idea(content_type, now or datetime.now())
         return idea
 
-    async def _create_content_idea(self, content_type: ContentType) -> Dict:
-        prompts = {
-            ContentType.TECHNICAL_TIP: self._get_technical_tip_prompt(),
-            ContentType.PROBLEM_SOLUTION: self._get_problem_solution_prompt(),
-            ContentType.TOOL_DISCOVERY: self._get_tool_discovery_prompt(),
-            ContentType.BEST_PRACTICE: self._get_best_practice_prompt(),
-            ContentType.INDUSTRY_NEWS: self._get_industry_news_prompt(),
-            ContentType.PERSONAL_INSIGHT: self._get_personal_insight_prompt()
-        }
-        prompt = prompts[content_type]
+    async def _create_content_idea(self, content_type: ContentType, now: datetime) -> Dict:
+        prompt = self.prompt_builders[content_type]()
         content = await self._call_ai_api(prompt)
-        logging.info(f"Content generated for {content_type.value}")
+        logging.info("Content generated for %s", content_type.value)
         return {
             "type": content_type.value,
             "content": content,
             "hashtags": self._select_hashtags(content_type),
-            "generated_at": datetime.now().isoformat()
+            "generated_at": now.isoformat(),
+            "cache_key": self._cache_key(prompt)
         }
 
     def _get_technical_tip_prompt(self) -> str:
-        tool = random.choice(self.topics["tools"])
-        return f"""Write a LinkedIn post about a useful {tool} tip or trick that DevOps engineers should know.
-        Requirements:
-        - Start with a hook that grabs attention
-        - Provide practical, actionable advice
-        - Include a brief code snippet or command if relevant
-        - Keep it under 300 words
-        - End with a question to encourage engagement
-        - Write in first person, conversational tone
-        - Don't include hashtags (they'll be added separately)
-        Make it feel authentic and based on real experience."""
+        return _TECH_TIP_TEMPLATE.format(tool=random.choice(self._TOOLS))
 
     def _get_problem_solution_prompt(self) -> str:
-        challenge = random.choice(self.topics["challenges"])
-        return f"""Write a LinkedIn post about solving a {challenge} challenge in DevOps.
-        Requirements:
-        - Start with the problem statement
-        - Describe the impact of the problem
-        - Present your solution approach
-        - Share the outcome or results
-        - Keep it under 300 words
-        - Write in first person, sharing a real experience feel
-        - Include emoji where appropriate for readability
-        - Don't include hashtags"""
+        return _PROBLEM_SOLUTION_TEMPLATE.format(challenge=random.choice(self._CHALLENGES))
 
     def _get_tool_discovery_prompt(self) -> str:
-        return f"""Write a LinkedIn post about discovering or trying a new DevOps tool or technology.
-        Requirements:
-        - Share excitement about the discovery
-        - Explain what the tool does
-        - Mention specific use cases
-        - Compare briefly with alternatives if relevant
-        - Keep it under 300 words
-        - Write enthusiastically but authentically
-        - Don't include hashtags"""
+        return _TOOL_DISCOVERY_PROMPT
 
     def _get_best_practice_prompt(self) -> str:
-        concept = random.choice(self.topics["concepts"])
-        return f"""Write a LinkedIn post about a {concept} best practice.
-        Requirements:
-        - Share a specific best practice
-        - Explain why it matters
-        - Provide a real-world example
-        - Mention common mistakes to avoid
-        - Keep it under 300 words
-        - Write in an educational but not preachy tone
-        - Don't include hashtags"""
+        return _BEST_PRACTICE_TEMPLATE.format(concept=random.choice(self._CONCEPTS))
 
     def _get_industry_news_prompt(self) -> str:
-        trend = random.choice(self.topics["trends"])
-        return f"""Write a LinkedIn post sharing thoughts on {trend} in the DevOps space.
-        Requirements:
-        - Start with an observation or recent development
-        - Share your perspective on why it matters
-        - Discuss potential impact on the industry
-        - Keep it under 300 words
-        - Write thoughtfully and forward-looking
-        - Don't include hashtags"""
+        return _INDUSTRY_NEWS_TEMPLATE.format(trend=random.choice(self._TRENDS))
 
     def _get_personal_insight_prompt(self) -> str:
-        return f"""Write a LinkedIn post sharing a personal insight or lesson learned as a DevOps engineer.
-        Requirements:
-        - Share a genuine learning moment
-        - Be vulnerable about mistakes or challenges
-        - Explain what you learned
-        - How it changed your approach
-        - Keep it under 300 words
-        - Write authentically and personally
-        - Don't include hashtags"""
+        return _PERSONAL_INSIGHT_PROMPT
 
     async def _call_ai_api(self, prompt: str) -> str:
+        if self._cache is not None and not self.force_refresh:
+            # pop rather than get: a cached post is handed out once so it can't be published twice
+            cached = self._cache.pop(self._cache_key(prompt))
+            if cached is not None:
+                logging.info("Using cached unpublished post, skipping OpenAI API call.")
+                return cached
+        return await self._request_completion(prompt)
+
+    def save_unpublished(self, idea: Dict):
+        # Only approved posts that weren't published are stored, for a later run to use once
+        if self._cache is not None:
+            self._cache.set(idea["cache_key"], idea["content"], expire=RESPONSE_CACHE_TTL)
+
+    def _cache_key(self, prompt: str) -> str:
+        return hashlib.blake2b(f"{self.model}\n{prompt}".encode()).hexdigest()
+
+    @retry(stop=stop_after_attempt(3), wait=_wait_retry_after, retry=retry_if_exception(_is_retryable), reraise=True)
+    async def _request_completion(self, prompt: str) -> str:
+        parts = []
+        word_count = 0
+        in_word = False
+        stream = self._call_ai_stream(prompt)
+        try:
+            async for delta in stream:
+                parts.append(delta)
+                # Count words incrementally; a word split across chunks is counted once
+                words = delta.split()
+                if words:
+                    word_count += len(words) - (1 if in_word and not delta[0].isspace() else 0)
+                in_word = not delta[-1].isspace()
+                if word_count > MAX_STREAM_WORDS:
+                    raise ValueError(f"Generated post exceeded {MAX_STREAM_WORDS} words, stream aborted")
+        finally:
+            # Closing the generator releases (and on early exit, closes) the response
+            await stream.aclose()
+        logging.info("OpenAI API called successfully.")
+        return "".join(parts)
+
+    async def _call_ai_stream(self, prompt: str) -> AsyncIterator[str]:
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         payload = {
+            **self._build_payload(prompt),
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        async with self.session.post(self.base_url, headers=headers, data=orjson.dumps(payload)) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:"):].strip()
+                if data == b"[DONE]":
+                    break
+                chunk = orjson.loads(data)
+                usage = chunk.get("usage")
+                if usage:
+                    cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+                    logging.info("Cached prompt tokens: %d", cached_tokens)
+                for choice in chunk.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+
+    def _build_payload(self, prompt: str) -> Dict:
+        return {
             "model": self.model,
             "messages": [
-                {"role": "system", "content": "You are an experienced DevOps Engineer and Python Developer with deep expertise in cloud automation (AWS, Azure), \
-                CI/CD pipeline development (Jenkins, GitHub Actions, ArgoCD), Infrastructure-as-Code (Terraform, AWS CDK), Kubernetes (EKS, Helm), and system monitoring \
-                (Prometheus, ELK Stack). Your goal is to write engaging, insightful, and technically accurate LinkedIn posts that share industry best practices, real-world \
-                 challenges, useful tips, and personal achievements in DevOps and Cloud Engineering. Posts should be professional yet approachable, concise, and inspire \
-                 discussions. Target an audience of developers, DevOps engineers, and cloud architects."},
+                self._system_message(),
                 {"role": "user", "content": prompt}
             ],
             "temperature": 0.8,
             "max_tokens": 500
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.post(self.base_url, headers=headers, json=payload, ssl=ssl_context) as response:
-                result = await response.json()
-                logging.info("OpenAI API called successfully.")
-                return result["choices"][0]["message"]["content"]
 
-    def _select_hashtags(self, content_type: ContentType, count: int = 5) -> List[str]:
+    def _system_message(self) -> Dict:
+        if self.use_cache_control:
+            # Explicit cache breakpoint for Anthropic-compatible endpoints
+            return {
+                "role": "system",
+                "content": [{"type": "text", "text": self._SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+            }
+        return {"role": "system", "content": self._SYSTEM_PROMPT}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # One pooled session per generator so repeated calls reuse the TLS connection
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(ssl=_ssl_context(), limit=100, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=OPENAI_TIMEOUT)
+        return self._session
+
+    async def aclose(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logging.info("OpenAI client session closed.")
+        self._session = None
+        if self._cache is not None:
+            self._cache.close()
+
+    async def create_batch(self, n_posts: int) -> str:
+        lines = []
+        for i in range(n_posts):
+            content_type = random.choice(list(ContentType))
+            lines.append(orjson.dumps({
+                # The content type rides along in custom_id so results can be parsed statelessly
+                "custom_id": f"post-{i}-{content_type.value}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_payload(self.prompt_builders[content_type]())
+            }))
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+
+        form = aiohttp.FormData()
+        form.add_field("purpose", "batch")
+        form.add_field("file", b"\n".join(lines), filename="devops_posts.jsonl", content_type="application/jsonl")
+        async with self.session.post(f"{self.api_base}/files", headers=headers, data=form) as response:
+            response.raise_for_status()
+            input_file_id = orjson.loads(await response.read())["id"]
+
+        batch_request = {
+            "input_file_id": input_file_id,
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h"
+        }
+        async with self.session.post(f"{self.api_base}/batches", headers={**headers, "Content-Type": "application/json"},
+                                     data=orjson.dumps(batch_request)) as response:
+            response.raise_for_status()
+            batch_id = orjson.loads(await response.read())["id"]
+        logging.info("Submitted OpenAI batch %s with %d requests.", batch_id, n_posts)
+        return batch_id
+
+    async def wait_for_batch(self, batch_id: str, poll_interval: float = 60.0,
+                             now: Optional[datetime] = None) -> List[Dict]:
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        while True:
+            async with self.session.get(f"{self.api_base}/batches/{batch_id}", headers=headers) as response:
+                response.raise_for_status()
+                batch = orjson.loads(await response.read())
+            status = batch["status"]
+            if status == "completed":
+                break
+            if status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"OpenAI batch {batch_id} ended with status {status}")
+            logging.info("OpenAI batch %s is %s, checking again in %.0fs.", batch_id, status, poll_interval)
+            await asyncio.sleep(poll_interval)
+
+        if not batch.get("output_file_id"):
+            # Every request failed: the batch completes with only an error file
+            logging.error("OpenAI batch %s produced no output, see error file %s.",
+                          batch_id, batch.get("error_file_id"))
+            return []
+
+        async with self.session.get(f"{self.api_base}/files/{batch['output_file_id']}/content",
+                                    headers=headers) as response:
+            response.raise_for_status()
+            output = await response.read()
+
+        now = now or datetime.now()
+        ideas = []
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = orjson.loads(line)
+            response_body = (result.get("response") or {}).get("body") or {}
+            if result.get("error") or not response_body.get("choices"):
+                logging.error("Batch request %s failed: %s", result.get("custom_id"), result.get("error"))
+                continue
+            content_type = ContentType(result["custom_id"].split("-", 2)[2])
+            ideas.append({
+                "type": content_type.value,
+                "content": response_body["choices"][0]["message"]["content"],
+                "hashtags": self._select_hashtags(content_type),
+                "generated_at": now.isoformat()
+            })
+        logging.info("OpenAI batch %s returned %d posts.", batch_id, len(ideas))
+        return ideas
+
+    def _build_hashtag_cache(self) -> Dict[ContentType, Tuple[List[str], List[str]]]:
+        # Per type: (fixed base + type tags, pool of extra tags not already fixed)
         base_tags = ["#DevOps", "#Python"]
         type_tags = {
             ContentType.TECHNICAL_TIP: ["#TechTips", "#DevOpsTools"],
@@ -180,22 +493,29 @@ class DevOpsContentGenerator:
             ContentType.INDUSTRY_NEWS: ["#TechNews", "#FutureOfTech"],
             ContentType.PERSONAL_INSIGHT: ["#CareerGrowth", "#LearningInPublic"]
         }
-        selected = base_tags + type_tags.get(content_type, [])
-        remaining = count - len(selected)
+        cache = {}
+        for content_type in ContentType:
+            fixed = base_tags + type_tags.get(content_type, [])
+            cache[content_type] = (fixed, [t for t in self._HASHTAG_POOL if t not in fixed])
+        return cache
+
+    def _select_hashtags(self, content_type: ContentType, count: int = 5) -> List[str]:
+        fixed, pool = self._hashtag_cache[content_type]
+        remaining = count - len(fixed)
         if remaining > 0:
-            additional = random.sample(
-                [t for t in self.hashtag_pool if t not in selected], 
-                min(remaining, len(self.hashtag_pool))
-            )
-            selected.extend(additional)
-        return selected[:count]
+            return fixed + random.sample(pool, min(remaining, len(pool)))
+        return fixed[:count]
 
 class ContentReviewer:
+    APPROVAL_THRESHOLD = 0.7
+    MAX_CHECK_SCORE = 1.0
+
     def __init__(self):
+        # Cheapest and most discriminating checks first so review_post can bail out early
         self.quality_checks = {
             "length": self._check_length,
-            "engagement": self._check_engagement,
             "technical_accuracy": self._check_technical,
+            "engagement": self._check_engagement,
             "readability": self._check_readability
         }
         logging.info("ContentReviewer initialized.")
@@ -203,22 +523,45 @@ class ContentReviewer:
     def review_post(self, post: LinkedInPost) -> Dict:
         scores = {}
         issues = []
-        for check_name, check_func in self.quality_checks.items():
-            score, issue = check_func(post.content)
+        # Tokenize once; each check picks the features it needs from these kwargs
+        content = post.content
+        features = {
+            "content": content,
+            "content_lower": content.lower(),
+            "word_count": len(content.split()),
+            "sentences": [s for s in _SENTENCE_RE.split(content) if s.strip()],
+        }
+        total_checks = len(self.quality_checks)
+        running_sum = 0.0
+        for index, (check_name, check_func) in enumerate(self.quality_checks.items(), start=1):
+            score, issue = check_func(**features)
             scores[check_name] = score
+            running_sum += score
             if issue:
                 issues.append(issue)
-        overall_score = sum(scores.values()) / len(scores)
-        logging.info(f"Post reviewed. Overall score: {overall_score:.2f}")
+            max_possible = (running_sum + (total_checks - index) * self.MAX_CHECK_SCORE) / total_checks
+            if max_possible < self.APPROVAL_THRESHOLD:
+                # Partial review: report the best score the post could still have reached
+                logging.info("Post rejected early after %s check. Best reachable score: %.2f",
+                             check_name, max_possible)
+                return {
+                    "scores": scores,
+                    "overall_score": max_possible,
+                    "issues": issues,
+                    "approved": False,
+                    "early_exit": True
+                }
+        overall_score = running_sum / total_checks
+        logging.info("Post reviewed. Overall score: %.2f", overall_score)
         return {
             "scores": scores,
             "overall_score": overall_score,
             "issues": issues,
-            "approved": overall_score >= 0.7
+            "approved": overall_score >= self.APPROVAL_THRESHOLD,
+            "early_exit": False
         }
 
-    def _check_length(self, content: str) -> tuple:
-        word_count = len(content.split())
+    def _check_length(self, word_count: int, **_) -> tuple:
         if word_count < 50:
             return (0.3, "Post is too short")
         elif word_count > 400:
@@ -228,11 +571,10 @@ class ContentReviewer:
         else:
             return (0.8, None)
 
-    def _check_engagement(self, content: str) -> tuple:
+    def _check_engagement(self, content: str, content_lower: str, **_) -> tuple:
         has_question = "?" in content
-        has_emoji = any(ord(char) > 127 for char in content)
-        has_call_to_action = any(phrase in content.lower() for phrase in 
-                                ["let me know", "what do you think", "share your", "comment below"])
+        has_emoji = _EMOJI_RE.search(content) is not None
+        has_call_to_action = _CTA_RE.search(content_lower) is not None
         score = 0.3
         if has_question: score += 0.3
         if has_emoji: score += 0.2
@@ -240,11 +582,9 @@ class ContentReviewer:
         issue = "Missing engagement elements" if score < 0.5 else None
         return (score, issue)
 
-    def _check_technical(self, content: str) -> tuple:
-        tech_terms = ["devops", "python", "cloud", "kubernetes", "docker", "ci/cd", 
-                     "automation", "infrastructure", "deployment", "pipeline"]
-        content_lower = content.lower()
-        term_count = sum(1 for term in tech_terms if term in content_lower)
+    def _check_technical(self, content_lower: str, **_) -> tuple:
+        # Distinct terms, so repeating one buzzword doesn't inflate the score
+        term_count = len(set(_TECH_RE.findall(content_lower)))
         if term_count == 0:
             return (0.2, "No technical terms found")
         elif term_count >= 3:
@@ -252,9 +592,8 @@ class ContentReviewer:
         else:
             return (0.6, None)
 
-    def _check_readability(self, content: str) -> tuple:
-        sentences = content.split('.')
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
+    def _check_readability(self, word_count: int, sentences: List[str], **_) -> tuple:
+        avg_sentence_length = word_count / len(sentences) if sentences else 0
         if avg_sentence_length > 25:
             return (0.5, "Sentences might be too complex")
         elif avg_sentence_length < 5:
@@ -263,31 +602,88 @@ class ContentReviewer:
             return (1.0, None)
 
 class DevOpsContentWorkflow:
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
-        self.generator = DevOpsContentGenerator(api_key=api_key, model=model)
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", force_refresh: bool = False,
+                 max_concurrency: int = 3, cache_dir: Optional[str] = None):
+        self.generator = DevOpsContentGenerator(api_key=api_key, model=model, force_refresh=force_refresh,
+                                                cache_dir=cache_dir)
+        self.max_concurrency = max_concurrency
         self.reviewer = ContentReviewer()
         self.console = Console()
         logging.info("DevOpsContentWorkflow initialized.")
 
-    async def run(self):
-        logging.info("Starting content generation workflow.")
-        idea = await self.generator.generate_content_ideas()
-        approved_posts = []
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self.generator.session
+
+    async def aclose(self):
+        await self.generator.aclose()
+
+    async def run(self, n_candidates: int = 3):
+        logging.info("Starting content generation workflow with %d candidates.", n_candidates)
+        # Bounded so a larger n_candidates doesn't trip OpenAI rate limits
+        semaphore = asyncio.Semaphore(min(n_candidates, self.max_concurrency))
+        # One timestamp per run, shared by every candidate
+        now = datetime.now()
+
+        async def generate():
+            async with semaphore:
+                return await self.generator.generate_content_ideas(now=now)
+
+        results = await asyncio.gather(*(generate() for _ in range(n_candidates)), return_exceptions=True)
+        ideas = [r for r in results if not isinstance(r, BaseException)]
+        for error in results:
+            if isinstance(error, BaseException):
+                logging.error("Candidate generation failed: %s", error)
+        if not ideas:
+            raise results[0]
+
+        approved = []
+        for idea in ideas:
+            review = self._review_idea(idea, now)
+            if review["approved"]:
+                approved.append((idea, review))
+
+        if approved:
+            approved.sort(key=lambda item: item[1]["overall_score"], reverse=True)
+            best_idea, best_review = approved[0]
+            # Approved runners-up are kept for a later run instead of being regenerated
+            for idea, _ in approved[1:]:
+                self.generator.save_unpublished(idea)
+            logging.info("✅ Approved: %s (score: %.2f)", best_idea['type'], best_review['overall_score'])
+            self.console.print(Markdown(best_idea.get("content")))
+            text_to_post = best_idea['content'] + "\n\n" + " ".join(best_idea['hashtags'])
+            logging.info("Post sent to LinkedIn automation.")
+            return text_to_post
+        return None
+
+    async def run_batch(self, n_posts: int = 7, poll_interval: float = 60.0) -> List[str]:
+        # Batch API: half the token price, results within 24h; suited to queueing a week of posts
+        logging.info("Starting batch content generation for %d posts.", n_posts)
+        batch_id = await self.generator.create_batch(n_posts)
+        now = datetime.now()
+        ideas = await self.generator.wait_for_batch(batch_id, poll_interval=poll_interval, now=now)
+        approved = [
+            idea['content'] + "\n\n" + " ".join(idea['hashtags'])
+            for idea in ideas
+            if self._review_idea(idea, now)["approved"]
+        ]
+        logging.info("Batch produced %d approved posts out of %d.", len(approved), len(ideas))
+        return approved
+
+    def _review_idea(self, idea: Dict, now: datetime) -> Dict:
         temp_post = LinkedInPost(
             content=idea["content"],
             hashtags=idea["hashtags"],
             post_type=ContentType(idea["type"]),
-            scheduled_time=datetime.now()
+            scheduled_time=now
         )
         review = self.reviewer.review_post(temp_post)
-        if review["approved"]:
-            approved_posts.append(idea)
-            logging.info(f"✅ Approved: {idea['type']} (score: {review['overall_score']:.2f})")
-            self.console.print(Markdown(idea.get("content")))
-        else:
-            logging.warning(f"❌ Rejected: {idea['type']} - Issues: {review['issues']}")
-        if approved_posts:
-            text_to_post = approved_posts[0]['content'] + "\n\n" + " ".join(approved_posts[0]['hashtags'])
-            logging.info("Post sent to LinkedIn automation.")
-            return text_to_post
-        return None
\ No newline at end of file
+        if not review["approved"]:
+            logging.warning("❌ Rejected: %s - Issues: %s", idea['type'], review['issues'])
+        return review
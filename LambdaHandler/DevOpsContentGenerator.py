@@ -1,19 +1,151 @@
+import hashlib
 import json
 import logging
 import random
+import re
 import os
-from datetime import datetime
-from typing import List, Dict
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain, islice
+from types import MappingProxyType
+from typing import Iterator, List, Dict, Optional, Tuple
 from dataclasses import dataclass
-from enum import Enum
-import urllib3
-import boto3
+from enum import StrEnum
+import textwrap
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-class ContentType(Enum):
+# orjson is used when the function has it available (e.g. via a layer); the
+# single-file deployment zip falls back to the stdlib. Both work on bytes.
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    json_loads = json.loads
+
+# urllib3 and boto3 are imported on first use rather than at module load, so a
+# code path pays only for the libraries it touches. The cached accessors keep one
+# client per container, so warm invocations reuse the same connections.
+@lru_cache(maxsize=None)
+def _http():
+    import urllib3
+    return urllib3.PoolManager(
+        num_pools=4,
+        maxsize=8,
+        retries=urllib3.Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=None,  # chat completions are safe to retry
+            raise_on_status=False
+        )
+    )
+
+@lru_cache(maxsize=None)
+def aws_client_config():
+    # Fail fast on AWS control-plane calls instead of the 60s/4-retry defaults
+    from botocore.config import Config
+    return Config(
+        connect_timeout=1,
+        read_timeout=5,
+        retries={"max_attempts": 2, "mode": "adaptive"},
+        tcp_keepalive=True
+    )
+
+@lru_cache(maxsize=None)
+def _lambda_client():
+    import boto3
+    return boto3.client('lambda', config=aws_client_config())
+
+def _dynamodb_table(table_name: str):
+    import boto3
+    return boto3.resource('dynamodb', config=aws_client_config()).Table(table_name)
+
+# Static system prefix, byte-identical across invocations and above OpenAI's
+# 1024-token threshold so repeated requests hit the automatic prompt cache.
+SYSTEM_PROMPT = textwrap.dedent("""
+    You are an experienced DevOps Engineer and Python Developer with deep expertise in cloud automation (AWS, Azure), CI/CD pipeline development (Jenkins, GitHub Actions, ArgoCD), Infrastructure-as-Code (Terraform, AWS CDK), Kubernetes (EKS, Helm), and system monitoring (Prometheus, ELK Stack). Your goal is to write engaging, insightful, and technically accurate LinkedIn posts that share industry best practices, real-world challenges, useful tips, and personal achievements in DevOps and Cloud Engineering. Posts should be professional yet approachable, concise, and inspire discussions. Target an audience of developers, DevOps engineers, and cloud architects.
+
+    Style guide:
+    - Open with a single-sentence hook that states a concrete observation, number, or surprise. Never open with "In today's fast-paced world" or similar filler.
+    - Use short paragraphs of one to three sentences separated by blank lines so the post reads well on mobile.
+    - Prefer specific tools, commands, versions, and metrics over generic statements. "We cut build time from 14 to 6 minutes" beats "we improved performance".
+    - When you include a command or code snippet, keep it under eight lines, make it copy-pasteable, and explain what it does in one sentence.
+    - Use emoji sparingly as visual anchors for lists or key points, at most one per paragraph.
+    - Write in first person and keep the tone conversational, humble, and practical. Share trade-offs and what did not work, not only successes.
+    - Avoid marketing language, buzzword stacking, and unverifiable claims. Do not invent statistics, customers, or product features.
+    - Stay between 120 and 300 words unless the request says otherwise.
+    - Finish with a genuine open question that invites readers to share their own experience.
+    - Never include hashtags; they are appended separately.
+
+    Example post 1 (technical tip):
+    Most Kubernetes outages I've debugged started with a pod that looked healthy but wasn't.
+
+    The culprit? Liveness and readiness probes pointing at the same endpoint.
+
+    When the database gets slow, the readiness check fails (good, traffic stops), but so does liveness, and the kubelet restarts every replica at once. Now a slow dependency has turned into a full outage.
+
+    What I do now:
+    🔹 Readiness checks dependencies: "can I serve traffic right now?"
+    🔹 Liveness checks only the process itself: "am I deadlocked?"
+    🔹 A startupProbe covers slow boots so liveness doesn't kill them early
+
+    kubectl get pods -o jsonpath='{.items[*].spec.containers[*].livenessProbe.httpGet.path}'
+
+    Run that across your namespaces. If it prints the same path as your readiness probe, you have a cascading restart waiting to happen.
+
+    How do you structure health checks in your clusters?
+
+    Example post 2 (lesson learned):
+    Last year I deleted a production Terraform state lock by hand. It did not go well.
+
+    A pipeline had crashed mid-apply and left the DynamoDB lock behind. I was in a hurry, so I force-unlocked it without checking whether another run was still active. It was. Two applies raced, and we spent the afternoon reconciling drifted security groups.
+
+    What changed afterwards:
+    ✅ Every pipeline run writes its run ID into the lock metadata
+    ✅ force-unlock requires a second approver in our runbook
+    ✅ We moved to smaller state files per service, so one stuck lock blocks less
+
+    The technical fix took an hour. The process fix took a month of conversations, and it mattered more.
+
+    Automation doesn't remove the need for guardrails; it just moves them earlier in the pipeline.
+
+    What's the most expensive "quick fix" you've learned from?
+
+    Example post 3 (best practice):
+    Your CI pipeline is only as fast as its slowest cache miss.
+
+    We had a GitHub Actions workflow that took 18 minutes on every pull request. Profiling it showed 11 of those minutes were spent reinstalling Python dependencies that had not changed in weeks.
+
+    Three changes brought it down to 7 minutes:
+    ⚡ Cache keyed on the hash of requirements.txt, not on the branch name
+    ⚡ Docker layer caching with a registry backend instead of the local runner
+    ⚡ Splitting unit and integration tests into parallel jobs
+
+    The lesson is that pipeline performance is an observability problem first. Measure each step before you optimize any of them, because the slow part is rarely where you expect it.
+
+    Which step in your pipeline would you profile first?
+
+    Example post 4 (industry perspective):
+    Platform engineering is not a rebrand of DevOps. It's what happens when DevOps succeeds and then has to scale.
+
+    Five years ago our team owned every Jenkins job, Terraform module, and Helm chart in the company. Each new service meant another ticket in our queue. We were the bottleneck we had promised to remove.
+
+    Building an internal platform changed the question from "can you deploy this for me?" to "which golden path fits my service?":
+    🧭 Templates for new services with CI, observability, and alerts wired in from day one
+    🧭 Self-service environments through a small API instead of a ticket
+    🧭 Guardrails expressed as policy-as-code rather than manual reviews
+
+    The hard part wasn't the tooling. It was treating developers as customers, running user interviews, and deleting features nobody used.
+
+    Is your team building a platform, or still running a ticket queue with extra steps?
+""").strip()
+
+class ContentType(StrEnum):
     TECHNICAL_TIP = "technical_tip"
     PROBLEM_SOLUTION = "problem_solution"
     TOOL_DISCOVERY = "tool_discovery"
@@ -24,222 +156,553 @@ class ContentType(Enum):
 @dataclass
 class LinkedInPost:
     content: str
-    hashtags: List[str]
+    hashtags: str
     post_type: str
     scheduled_time: str
     status: str = "pending"
 
+OPENAI_API_BASE = "https://api.openai.com/v1"
+RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60  # 7 days
+POST_QUEUE_NAME = "linkedin"
+# Partition in the queue table recording batches whose posts were already enqueued
+COLLECTED_BATCHES = "collected_batches"
+# DynamoDB transactions hold at most 100 items: the collected marker plus the posts
+MAX_BATCH_POSTS = 99
+# Anything longer fails ContentReviewer's length check, so stop paying for it
+MAX_STREAM_WORDS = 400
+# Completions per chat request: one input-token charge, best reviewed candidate wins
+N_CANDIDATES = 3
+
+# Built once per container instead of on every generator/reviewer construction
+TOPICS = MappingProxyType({
+    "tools": ("Kubernetes", "Docker", "Terraform", "Ansible", "Jenkins",
+              "GitLab CI", "GitHub Actions", "ArgoCD", "Prometheus", "Grafana"),
+    "concepts": ("CI/CD", "Infrastructure as Code", "GitOps", "Service Mesh",
+                 "Observability", "Chaos Engineering", "SRE", "Platform Engineering"),
+    "challenges": ("scaling", "monitoring", "security", "cost optimization",
+                   "deployment failures", "debugging", "performance tuning"),
+    "trends": ("AI in DevOps", "FinOps", "Platform Engineering", "Green Computing",
+               "Edge Computing", "Serverless", "WebAssembly")
+})
+HASHTAG_POOL = (
+    "#DevOps", "#Python", "#CloudComputing", "#Kubernetes", "#Docker",
+    "#CI/CD", "#InfrastructureAsCode", "#SRE", "#PlatformEngineering",
+    "#TechTips", "#CloudNative", "#Automation", "#DevOpsLife", "#AWS"
+)
+_HASHTAG_SET = frozenset(HASHTAG_POOL)
+TECH_TERMS = frozenset({
+    "devops", "python", "cloud", "kubernetes", "docker", "ci/cd",
+    "automation", "infrastructure", "deployment", "pipeline", "aws", "lambda"
+})
+
+# (topic key, template) per content type; templates with a topic key take a {topic} placeholder
+PROMPT_TEMPLATES = MappingProxyType({
+    ContentType.TECHNICAL_TIP: ("tools", textwrap.dedent("""\
+    Requirements:
+    - Start with a hook that grabs attention
+    - Provide practical, actionable advice
+    - Include a brief code snippet or command if relevant
+    - Keep it under 300 words
+    - End with a question to encourage engagement
+    - Write in first person, conversational tone
+    - Don't include hashtags (they'll be added separately)
+    Make it feel authentic and based on real experience.
+
+    Write a LinkedIn post about a useful {topic} tip or trick that DevOps engineers should know.""")),
+    ContentType.PROBLEM_SOLUTION: ("challenges", textwrap.dedent("""\
+    Requirements:
+    - Start with the problem statement
+    - Describe the impact of the problem
+    - Present your solution approach
+    - Share the outcome or results
+    - Keep it under 300 words
+    - Write in first person, sharing a real experience feel
+    - Include emoji where appropriate for readability
+    - Don't include hashtags
+
+    Write a LinkedIn post about solving a {topic} challenge in DevOps.""")),
+    ContentType.TOOL_DISCOVERY: (None, textwrap.dedent("""\
+    Requirements:
+    - Share excitement about the discovery
+    - Explain what the tool does
+    - Mention specific use cases
+    - Compare briefly with alternatives if relevant
+    - Keep it under 300 words
+    - Write enthusiastically but authentically
+    - Don't include hashtags
+
+    Write a LinkedIn post about discovering or trying a new DevOps tool or technology.""")),
+    ContentType.BEST_PRACTICE: ("concepts", textwrap.dedent("""\
+    Requirements:
+    - Share a specific best practice
+    - Explain why it matters
+    - Provide a real-world example
+    - Mention common mistakes to avoid
+    - Keep it under 300 words
+    - Write in an educational but not preachy tone
+    - Don't include hashtags
+
+    Write a LinkedIn post about a {topic} best practice.""")),
+    ContentType.INDUSTRY_NEWS: ("trends", textwrap.dedent("""\
+    Requirements:
+    - Start with an observation or recent development
+    - Share your perspective on why it matters
+    - Discuss potential impact on the industry
+    - Keep it under 300 words
+    - Write thoughtfully and forward-looking
+    - Don't include hashtags
+
+    Write a LinkedIn post sharing thoughts on {topic} in the DevOps space.""")),
+    ContentType.PERSONAL_INSIGHT: (None, textwrap.dedent("""\
+    Requirements:
+    - Share a genuine learning moment
+    - Be vulnerable about mistakes or challenges
+    - Explain what you learned
+    - How it changed your approach
+    - Keep it under 300 words
+    - Write authentically and personally
+    - Don't include hashtags
+
+    Write a LinkedIn post sharing a personal insight or lesson learned as a DevOps engineer.""")),
+})
+
+# Single-pass scanner for ContentReviewer. The alternatives never overlap, so one
+# finditer picks up sentence breaks, questions, emoji, calls to action and tech terms.
+_REVIEW_RE = re.compile(
+    r"(?P<period>\.)|(?P<question>\?)|(?P<emoji>[^\x00-\x7F])"
+    r"|(?P<cta>let me know|what do you think|share your|comment below)"
+    r"|(?P<tech>" + "|".join(map(re.escape, sorted(TECH_TERMS, key=lambda t: (-len(t), t)))) + ")",
+    re.IGNORECASE
+)
+
+@dataclass
+class PostFeatures:
+    word_count: int
+    sentence_count: int
+    has_question: bool
+    has_emoji: bool
+    has_call_to_action: bool
+    tech_term_count: int
+
+class ResponseCache:
+    """
+    DynamoDB store of approved posts that were generated but not published.
+    Entries are handed out at most once, so a cached post can't be published
+    twice. Expiry is stored in the `expires_at` attribute, which should be
+    configured as the table's TTL attribute.
+    """
+    def __init__(self, table_name: str):
+        self.table = _dynamodb_table(table_name)
+
+    def take(self, key: str) -> Optional[str]:
+        """Remove and return the entry for key; the delete makes the claim atomic across containers"""
+        try:
+            item = self.table.delete_item(Key={"cache_key": key}, ReturnValues="ALL_OLD").get("Attributes")
+        except Exception as e:
+            logger.warning("Response cache lookup failed: %s", e)
+            return None
+        # DynamoDB TTL deletes lazily, so expired items can still be returned
+        if not item or int(item["expires_at"]) <= int(time.time()):
+            return None
+        return item["content"]
+
+    def put(self, key: str, value: str, ttl: int = RESPONSE_CACHE_TTL):
+        expires_at = int(time.time()) + ttl
+        try:
+            self.table.put_item(Item={"cache_key": key, "content": value, "expires_at": expires_at})
+        except Exception as e:
+            logger.warning("Response cache write failed: %s", e)
+
+@lru_cache(maxsize=None)
+def get_response_cache(table_name: str) -> ResponseCache:
+    # One table resource per container, reused across warm starts
+    return ResponseCache(table_name)
+
+class PostQueue:
+    """
+    DynamoDB queue of approved posts filled by batch generation.
+    Table keys: partition key `queue` (String), sort key `enqueued_at` (String).
+    """
+    def __init__(self, table_name: str):
+        self.table = _dynamodb_table(table_name)
+
+    def push_batch(self, batch_id: str, contents: List[str]) -> bool:
+        """
+        Enqueue a batch's posts and mark the batch collected in one transaction, so a
+        retry either finishes the enqueue or does nothing. False if already collected.
+        """
+        client = self.table.meta.client
+        enqueued_at = datetime.now(timezone.utc).isoformat()
+        marker = {
+            "Put": {
+                "TableName": self.table.name,
+                "Item": {"queue": {"S": COLLECTED_BATCHES}, "enqueued_at": {"S": batch_id}},
+                "ConditionExpression": "attribute_not_exists(enqueued_at)"
+            }
+        }
+        posts = [
+            {
+                "Put": {
+                    "TableName": self.table.name,
+                    # Index suffix keeps sort keys unique within the batch
+                    "Item": {
+                        "queue": {"S": POST_QUEUE_NAME},
+                        "enqueued_at": {"S": f"{enqueued_at}#{index:04d}"},
+                        "content": {"S": content}
+                    }
+                }
+            }
+            for index, content in enumerate(contents)
+        ]
+        try:
+            client.transact_write_items(TransactItems=[marker, *posts])
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get("CancellationReasons") or []
+            if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+                return False
+            raise
+        return True
+
+    def pop(self) -> Optional[Dict]:
+        """Claim the oldest post; the returned item can be handed back with requeue()"""
+        result = self.table.query(
+            KeyConditionExpression="#q = :q",
+            ExpressionAttributeNames={"#q": "queue"},
+            ExpressionAttributeValues={":q": POST_QUEUE_NAME},
+            ScanIndexForward=True,
+            Limit=1
+        )
+        items = result.get("Items") or []
+        if not items:
+            return None
+        item = items[0]
+        try:
+            # Conditional delete so two concurrent pollers can't both claim the same post
+            self.table.delete_item(
+                Key={"queue": item["queue"], "enqueued_at": item["enqueued_at"]},
+                ConditionExpression="attribute_exists(enqueued_at)"
+            )
+        except self.table.meta.client.exceptions.ConditionalCheckFailedException:
+            return None
+        return item
+
+    def requeue(self, item: Dict):
+        # Same sort key, so a post that failed to publish keeps its place at the head
+        self.table.put_item(Item={
+            "queue": POST_QUEUE_NAME,
+            "enqueued_at": item["enqueued_at"],
+            "content": item["content"]
+        })
+
+@lru_cache(maxsize=None)
+def _post_queue(table_name: str) -> PostQueue:
+    return PostQueue(table_name)
+
+def get_post_queue() -> Optional[PostQueue]:
+    table_name = os.environ.get('POST_QUEUE_TABLE')
+    return _post_queue(table_name) if table_name else None
+
 class DevOpsContentGenerator:
+    _BASE_TAGS = ("#DevOps", "#Python", "#AWS")
+    _TYPE_TAGS = MappingProxyType({
+        ContentType.TECHNICAL_TIP: ("#TechTips", "#DevOpsTools"),
+        ContentType.PROBLEM_SOLUTION: ("#ProblemSolving", "#Engineering"),
+        ContentType.TOOL_DISCOVERY: ("#DevOpsTools", "#Technology"),
+        ContentType.BEST_PRACTICE: ("#BestPractices", "#DevOpsLife"),
+        ContentType.INDUSTRY_NEWS: ("#TechNews", "#FutureOfTech"),
+        ContentType.PERSONAL_INSIGHT: ("#CareerGrowth", "#LearningInPublic")
+    })
+
     def __init__(self):
         self.api_key = os.environ.get('OPENAI_API_KEY')
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
         self.model = os.environ.get('OPENAI_MODEL', 'gpt-4o-mini')
-        self.topics = {
-            "tools": ["Kubernetes", "Docker", "Terraform", "Ansible", "Jenkins", 
-                     "GitLab CI", "GitHub Actions", "ArgoCD", "Prometheus", "Grafana"],
-            "concepts": ["CI/CD", "Infrastructure as Code", "GitOps", "Service Mesh",
-                        "Observability", "Chaos Engineering", "SRE", "Platform Engineering"],
-            "challenges": ["scaling", "monitoring", "security", "cost optimization",
-                          "deployment failures", "debugging", "performance tuning"],
-            "trends": ["AI in DevOps", "FinOps", "Platform Engineering", "Green Computing",
-                      "Edge Computing", "Serverless", "WebAssembly"]
-        }
-        self.hashtag_pool = [
-            "#DevOps", "#Python", "#CloudComputing", "#Kubernetes", "#Docker",
-            "#CI/CD", "#InfrastructureAsCode", "#SRE", "#PlatformEngineering",
-            "#TechTips", "#CloudNative", "#Automation", "#DevOpsLife", "#AWS"
-        ]
+        # Explicit cache breakpoints for Anthropic/Azure-compatible endpoints
+        self.use_cache_control = os.environ.get('OPENAI_CACHE_CONTROL', '').lower() == 'true'
+        # Caching is opt-in: only enabled when RESPONSE_CACHE_TABLE names a table
+        cache_table = os.environ.get('RESPONSE_CACHE_TABLE')
+        self.cache = get_response_cache(cache_table) if cache_table else None
+        self.reviewer = ContentReviewer()
 
-    def generate_content_ideas(self) -> Dict:
+    def generate_content_ideas(self, now: Optional[str] = None) -> Dict:
         content_types = list(ContentType)
         key = "LAST_CONTENT_TYPE"
-        last_selected_type = os.environ.get(key)
-        content_types = [ct for ct in content_types if ct.value != last_selected_type]
-        content_type = random.choice(content_types)
-        
-        logger.info(f"Updating environment variable {key} to {content_type.value}")
-        client = boto3.client('lambda')
         function_name='DevOpsContentGenerator'
-        response = client.get_function_configuration(
+        response = _lambda_client().get_function_configuration(
             FunctionName=function_name
         )
 
+        # Read the rotation state from the function config rather than os.environ,
+        # so it stays correct when this module runs inside LinkedInPostAutomator
         env_vars = response["Environment"]["Variables"]
+        last_selected_type = env_vars.get(key)
+        content_types = [ct for ct in content_types if ct != last_selected_type]
+        content_type = random.choice(content_types)
+
+        logger.info("Updating environment variable %s to %s", key, content_type)
         if key in env_vars:
-            env_vars[key] = content_type.value
+            env_vars[key] = content_type
 
         # Push update back
-        client.update_function_configuration(
+        _lambda_client().update_function_configuration(
             FunctionName=function_name,
             Environment={"Variables": env_vars}
         )
 
-        logger.info(f"Generating content idea for type: {content_type.value}")
-        idea = self._create_content_idea(content_type)
+        logger.info("Generating content idea for type: %s", content_type)
+        idea = self._create_content_idea(content_type, now)
         return idea
 
-    def _create_content_idea(self, content_type: ContentType) -> Dict:
-        prompts = {
-            ContentType.TECHNICAL_TIP: self._get_technical_tip_prompt(),
-            ContentType.PROBLEM_SOLUTION: self._get_problem_solution_prompt(),
-            ContentType.TOOL_DISCOVERY: self._get_tool_discovery_prompt(),
-            ContentType.BEST_PRACTICE: self._get_best_practice_prompt(),
-            ContentType.INDUSTRY_NEWS: self._get_industry_news_prompt(),
-            ContentType.PERSONAL_INSIGHT: self._get_personal_insight_prompt()
-        }
-        prompt = prompts[content_type]
-        content = self._call_openai_api(prompt)
+    def _create_content_idea(self, content_type: ContentType, now: Optional[str] = None) -> Dict:
+        now = now or datetime.now(timezone.utc).isoformat()
+        prompt = self._get_prompt(content_type)
+        hashtags = self._select_hashtags(content_type)
+        # Versioned by model so switching models doesn't serve stale completions
+        key = hashlib.sha256(f"{self.model}:{content_type}:{prompt}".encode('utf-8')).hexdigest()
+        content = self.cache.take(key) if self.cache else None
+        if content is not None:
+            logger.info("Using cached unpublished post for %s", content_type)
+        else:
+            ranked = self._rank_candidates(self._call_openai_api(prompt), content_type, hashtags, now)
+            content = ranked[0][1]
+            # The best candidate is about to be used; keep the runner-up for a later
+            # invocation, but only if it passed review
+            if self.cache and len(ranked) > 1 and ranked[1][0]["approved"]:
+                self.cache.put(key, ranked[1][1])
         
         return {
-            "type": content_type.value,
+            "type": content_type,
             "content": content,
-            "hashtags": self._select_hashtags(content_type),
-            "generated_at": datetime.now().isoformat()
+            "hashtags": hashtags,
+            "generated_at": now
         }
 
-    def _call_openai_api(self, prompt: str) -> str:
-        """Call OpenAI API using boto3 and Lambda layer or direct HTTP"""
-        
-        http = urllib3.PoolManager()
-        
+    def _rank_candidates(self, candidates: List[str], content_type: ContentType, hashtags: str,
+                         now: str) -> List[Tuple[Dict, str]]:
+        """Review every candidate completion and return (review, content) pairs, best first"""
+        ranked = sorted(
+            (
+                (self.reviewer.review_post(LinkedInPost(
+                    content=candidate,
+                    hashtags=hashtags,
+                    post_type=content_type,
+                    scheduled_time=now
+                )), candidate)
+                for candidate in candidates
+            ),
+            key=lambda item: item[0]["overall_score"],
+            reverse=True
+        )
+        logger.info("Picked candidate scoring %.2f out of %s", ranked[0][0]["overall_score"], len(ranked))
+        return ranked
+
+    def _get_prompt(self, content_type: ContentType) -> str:
+        topic_key, template = PROMPT_TEMPLATES[content_type]
+        if topic_key is None:
+            return template
+        return template.format(topic=random.choice(TOPICS[topic_key]))
+
+    def _call_openai_api(self, prompt: str, n: int = N_CANDIDATES) -> List[str]:
+        """Stream n completions for the prompt, dropping any that run past MAX_STREAM_WORDS"""
+        parts = [[] for _ in range(n)]
+        word_counts = [0] * n
+        in_word = [False] * n
+        stream = self._stream_openai_api(prompt, n)
+        try:
+            for index, delta in stream:
+                if word_counts[index] > MAX_STREAM_WORDS:
+                    continue
+                parts[index].append(delta)
+                # Count words incrementally; a word split across chunks is counted once
+                words = delta.split()
+                if words:
+                    word_counts[index] += len(words) - (1 if in_word[index] and not delta[0].isspace() else 0)
+                in_word[index] = not delta[-1].isspace()
+                if all(count > MAX_STREAM_WORDS for count in word_counts):
+                    raise ValueError(f"All {n} generated posts exceeded {MAX_STREAM_WORDS} words, stream aborted")
+        except Exception as e:
+            logger.error("Error calling OpenAI API: %s", e)
+            raise
+        finally:
+            # Closing the generator releases (and on early exit, closes) the response
+            stream.close()
+        candidates = [
+            "".join(chunks)
+            for chunks, count in zip(parts, word_counts)
+            if chunks and count <= MAX_STREAM_WORDS
+        ]
+        if not candidates:
+            raise ValueError("OpenAI API returned no usable completions")
+        return candidates
+
+    def _stream_openai_api(self, prompt: str, n: int = 1) -> Iterator[Tuple[int, str]]:
+        """Yield (choice index, content delta) pairs from a streamed chat completion"""
+        body = json_dumps({**self._build_payload(prompt), "stream": True, "n": n})
         headers = {
             "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            "Content-Length": str(len(body)),
+            # A compressor may hold back small SSE chunks, which would delay the word cutoff
+            "Accept-Encoding": "identity"
         }
-        
-        payload = {
+
+        response = _http().request(
+            'POST',
+            f"{OPENAI_API_BASE}/chat/completions",
+            body=body,
+            headers=headers,
+            preload_content=False
+        )
+        finished = False
+        try:
+            if response.status != 200:
+                raise RuntimeError(f"OpenAI API error: {response.status} - {response.data}")
+            for line in response:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:"):].strip()
+                if data == b"[DONE]":
+                    break
+                chunk = json_loads(data)
+                for choice in chunk.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yield choice.get("index", 0), delta
+            finished = True
+        finally:
+            if finished:
+                # Read the trailing bytes so the connection goes back to the pool reusable
+                response.drain_conn()
+            else:
+                # Stopped early: drop the socket instead of reading the rest of the completion
+                response.close()
+                response.release_conn()
+
+    def _build_payload(self, prompt: str) -> Dict:
+        return {
             "model": self.model,
             "messages": [
-                {"role": "system", "content": "You are an experienced DevOps Engineer and Python Developer with deep expertise in cloud automation (AWS, Azure), \
-                CI/CD pipeline development (Jenkins, GitHub Actions, ArgoCD), Infrastructure-as-Code (Terraform, AWS CDK), Kubernetes (EKS, Helm), and system monitoring \
-                (Prometheus, ELK Stack). Your goal is to write engaging, insightful, and technically accurate LinkedIn posts that share industry best practices, real-world \
-                 challenges, useful tips, and personal achievements in DevOps and Cloud Engineering. Posts should be professional yet approachable, concise, and inspire \
-                 discussions. Target an audience of developers, DevOps engineers, and cloud architects."},
+                self._system_message(),
                 {"role": "user", "content": prompt}
             ],
             "temperature": 0.8,
             "max_tokens": 500
         }
-        
-        try:
-            response = http.request(
-                'POST',
-                'https://api.openai.com/v1/chat/completions',
-                body=json.dumps(payload).encode('utf-8'),
-                headers=headers
-            )
-            result = json.loads(response.data.decode('utf-8'))
-            return result["choices"][0]["message"]["content"]
-        except Exception as e:
-            logger.error(f"Error calling OpenAI API: {e}")
-            raise
 
-    def _get_technical_tip_prompt(self) -> str:
-        tool = random.choice(self.topics["tools"])
-        return f"""Write a LinkedIn post about a useful {tool} tip or trick that DevOps engineers should know.
-        Requirements:
-        - Start with a hook that grabs attention
-        - Provide practical, actionable advice
-        - Include a brief code snippet or command if relevant
-        - Keep it under 300 words
-        - End with a question to encourage engagement
-        - Write in first person, conversational tone
-        - Don't include hashtags (they'll be added separately)
-        Make it feel authentic and based on real experience."""
-
-    def _get_problem_solution_prompt(self) -> str:
-        challenge = random.choice(self.topics["challenges"])
-        return f"""Write a LinkedIn post about solving a {challenge} challenge in DevOps.
-        Requirements:
-        - Start with the problem statement
-        - Describe the impact of the problem
-        - Present your solution approach
-        - Share the outcome or results
-        - Keep it under 300 words
-        - Write in first person, sharing a real experience feel
-        - Include emoji where appropriate for readability
-        - Don't include hashtags"""
-
-    def _get_tool_discovery_prompt(self) -> str:
-        return f"""Write a LinkedIn post about discovering or trying a new DevOps tool or technology.
-        Requirements:
-        - Share excitement about the discovery
-        - Explain what the tool does
-        - Mention specific use cases
-        - Compare briefly with alternatives if relevant
-        - Keep it under 300 words
-        - Write enthusiastically but authentically
-        - Don't include hashtags"""
-
-    def _get_best_practice_prompt(self) -> str:
-        concept = random.choice(self.topics["concepts"])
-        return f"""Write a LinkedIn post about a {concept} best practice.
-        Requirements:
-        - Share a specific best practice
-        - Explain why it matters
-        - Provide a real-world example
-        - Mention common mistakes to avoid
-        - Keep it under 300 words
-        - Write in an educational but not preachy tone
-        - Don't include hashtags"""
-
-    def _get_industry_news_prompt(self) -> str:
-        trend = random.choice(self.topics["trends"])
-        return f"""Write a LinkedIn post sharing thoughts on {trend} in the DevOps space.
-        Requirements:
-        - Start with an observation or recent development
-        - Share your perspective on why it matters
-        - Discuss potential impact on the industry
-        - Keep it under 300 words
-        - Write thoughtfully and forward-looking
-        - Don't include hashtags"""
-
-    def _get_personal_insight_prompt(self) -> str:
-        return f"""Write a LinkedIn post sharing a personal insight or lesson learned as a DevOps engineer.
-        Requirements:
-        - Share a genuine learning moment
-        - Be vulnerable about mistakes or challenges
-        - Explain what you learned
-        - How it changed your approach
-        - Keep it under 300 words
-        - Write authentically and personally
-        - Don't include hashtags"""
-
-    def _select_hashtags(self, content_type: ContentType, count: int = 5) -> List[str]:
-        base_tags = ["#DevOps", "#Python", "#AWS"]
-        type_tags = {
-            ContentType.TECHNICAL_TIP: ["#TechTips", "#DevOpsTools"],
-            ContentType.PROBLEM_SOLUTION: ["#ProblemSolving", "#Engineering"],
-            ContentType.TOOL_DISCOVERY: ["#DevOpsTools", "#Technology"],
-            ContentType.BEST_PRACTICE: ["#BestPractices", "#DevOpsLife"],
-            ContentType.INDUSTRY_NEWS: ["#TechNews", "#FutureOfTech"],
-            ContentType.PERSONAL_INSIGHT: ["#CareerGrowth", "#LearningInPublic"]
-        }
-        selected = base_tags + type_tags.get(content_type, [])
-        remaining = count - len(selected)
+    def generate_batch(self, n: int) -> str:
+        """Submit n post generations to the OpenAI Batch API and return the batch id"""
+        lines = []
+        for i in range(n):
+            content_type = random.choice(list(ContentType))
+            lines.append(json_dumps({
+                # The content type rides along in custom_id so results can be parsed statelessly
+                "custom_id": f"post-{i}-{content_type}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_payload(self._get_prompt(content_type))
+            }))
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+
+        response = _http().request(
+            'POST',
+            f"{OPENAI_API_BASE}/files",
+            fields={
+                "purpose": "batch",
+                "file": ("devops_posts.jsonl", b"\n".join(lines), "application/jsonl")
+            },
+            headers=headers,
+            # Not idempotent: a retried 5xx whose upload/creation succeeded would duplicate it
+            retries=False
+        )
+        if response.status != 200:
+            raise RuntimeError(f"Batch file upload failed: {response.status} - {response.data}")
+        input_file_id = json_loads(response.data)["id"]
+
+        response = _http().request(
+            'POST',
+            f"{OPENAI_API_BASE}/batches",
+            body=json_dumps({
+                "input_file_id": input_file_id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h"
+            }),
+            headers={**headers, "Content-Type": "application/json"},
+            # A duplicate batch would run (and be billed) twice
+            retries=False
+        )
+        if response.status != 200:
+            raise RuntimeError(f"Batch creation failed: {response.status} - {response.data}")
+        batch_id = json_loads(response.data)["id"]
+        logger.info("Submitted OpenAI batch %s with %s requests", batch_id, n)
+        return batch_id
+
+    def fetch_batch_results(self, batch_id: str, now: Optional[str] = None) -> Tuple[str, List[Dict]]:
+        """Return the batch status and, once completed, its results as content ideas"""
+        # The results file holds every completion in the batch, so have it sent compressed
+        headers = {"Authorization": f"Bearer {self.api_key}", "Accept-Encoding": "gzip"}
+        response = _http().request('GET', f"{OPENAI_API_BASE}/batches/{batch_id}", headers=headers)
+        if response.status != 200:
+            raise RuntimeError(f"Batch lookup failed: {response.status} - {response.data}")
+        batch = json_loads(response.data)
+        status = batch["status"]
+        if status in ("failed", "expired", "cancelled"):
+            raise RuntimeError(f"OpenAI batch {batch_id} ended with status {status}")
+        if status != "completed":
+            return status, []
+        if not batch.get("output_file_id"):
+            # Every request failed: the batch completes with only an error file
+            logger.error("OpenAI batch %s produced no output, see error file %s", batch_id, batch.get("error_file_id"))
+            return status, []
+
+        response = _http().request('GET', f"{OPENAI_API_BASE}/files/{batch['output_file_id']}/content", headers=headers)
+        if response.status != 200:
+            raise RuntimeError(f"Batch output download failed: {response.status} - {response.data}")
+        now = now or datetime.now(timezone.utc).isoformat()
+        ideas = []
+        for line in response.data.splitlines():
+            if not line.strip():
+                continue
+            result = json_loads(line)
+            body = (result.get("response") or {}).get("body") or {}
+            if result.get("error") or not body.get("choices"):
+                logger.error("Batch request %s failed: %s", result.get('custom_id'), result.get('error'))
+                continue
+            content_type = ContentType(result["custom_id"].split("-", 2)[2])
+            ideas.append({
+                "type": content_type,
+                "content": body["choices"][0]["message"]["content"],
+                "hashtags": self._select_hashtags(content_type),
+                "generated_at": now
+            })
+        return status, ideas
+
+    def _system_message(self) -> Dict:
+        if self.use_cache_control:
+            return {
+                "role": "system",
+                "content": [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+            }
+        return {"role": "system", "content": SYSTEM_PROMPT}
+
+    def _select_hashtags(self, content_type: ContentType, count: int = 5) -> str:
+        """Return up to `count` space-separated hashtags: base, type-specific, then random extras"""
+        type_tags = self._TYPE_TAGS.get(content_type, ())
+        tags = chain(self._BASE_TAGS, type_tags)
+        remaining = count - len(self._BASE_TAGS) - len(type_tags)
         if remaining > 0:
-            additional = random.sample(
-                [t for t in self.hashtag_pool if t not in selected], 
-                min(remaining, len(self.hashtag_pool))
-            )
-            selected.extend(additional)
-        return selected[:count]
+            pool = list(_HASHTAG_SET.difference(self._BASE_TAGS, type_tags))
+            tags = chain(tags, random.sample(pool, min(remaining, len(pool))))
+        return " ".join(islice(tags, count))
 
 class ContentReviewer:
-    def __init__(self):
-        self.quality_checks = {
-            "length": self._check_length,
-            "engagement": self._check_engagement,
-            "technical_accuracy": self._check_technical,
-            "readability": self._check_readability
-        }
-
     def review_post(self, post: LinkedInPost) -> Dict:
         scores = {}
         issues = []
+        features = self._collect_features(post.content)
         for check_name, check_func in self.quality_checks.items():
-            score, issue = check_func(post.content)
+            score, issue = check_func(self, features)
             scores[check_name] = score
             if issue:
                 issues.append(issue)
@@ -252,8 +715,31 @@ class ContentReviewer:
             "approved": overall_score >= 0.7
         }
 
-    def _check_length(self, content: str) -> tuple:
-        word_count = len(content.split())
+    def _collect_features(self, content: str) -> PostFeatures:
+        """Gather everything the checks need in one regex pass plus one whitespace split"""
+        periods = 0
+        found = set()
+        tech_terms = set()
+        for match in _REVIEW_RE.finditer(content):
+            kind = match.lastgroup
+            if kind == "period":
+                periods += 1
+            elif kind == "tech":
+                tech_terms.add(match.group(0).lower())
+            else:
+                found.add(kind)
+        return PostFeatures(
+            word_count=len(content.split()),
+            # Same count as len(content.split('.'))
+            sentence_count=periods + 1,
+            has_question="question" in found,
+            has_emoji="emoji" in found,
+            has_call_to_action="cta" in found,
+            tech_term_count=len(tech_terms)
+        )
+
+    def _check_length(self, features: PostFeatures) -> tuple:
+        word_count = features.word_count
         if word_count < 50:
             return (0.3, "Post is too short")
         elif word_count > 400:
@@ -263,23 +749,16 @@ class ContentReviewer:
         else:
             return (0.8, None)
 
-    def _check_engagement(self, content: str) -> tuple:
-        has_question = "?" in content
-        has_emoji = any(ord(char) > 127 for char in content)
-        has_call_to_action = any(phrase in content.lower() for phrase in 
-                                ["let me know", "what do you think", "share your", "comment below"])
+    def _check_engagement(self, features: PostFeatures) -> tuple:
         score = 0.3
-        if has_question: score += 0.3
-        if has_emoji: score += 0.2
-        if has_call_to_action: score += 0.2
+        if features.has_question: score += 0.3
+        if features.has_emoji: score += 0.2
+        if features.has_call_to_action: score += 0.2
         issue = "Missing engagement elements" if score < 0.5 else None
         return (score, issue)
 
-    def _check_technical(self, content: str) -> tuple:
-        tech_terms = ["devops", "python", "cloud", "kubernetes", "docker", "ci/cd", 
-                     "automation", "infrastructure", "deployment", "pipeline", "aws", "lambda"]
-        content_lower = content.lower()
-        term_count = sum(1 for term in tech_terms if term in content_lower)
+    def _check_technical(self, features: PostFeatures) -> tuple:
+        term_count = features.tech_term_count
         if term_count == 0:
             return (0.2, "No technical terms found")
         elif term_count >= 3:
@@ -287,9 +766,9 @@ class ContentReviewer:
         else:
             return (0.6, None)
 
-    def _check_readability(self, content: str) -> tuple:
-        sentences = content.split('.')
-        avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences) if sentences else 0
+    def _check_readability(self, features: PostFeatures) -> tuple:
+        # Total words over sentences; equal to the per-sentence sum except for words containing '.'
+        avg_sentence_length = features.word_count / features.sentence_count
         if avg_sentence_length > 25:
             return (0.5, "Sentences might be too complex")
         elif avg_sentence_length < 5:
@@ -297,27 +776,98 @@ class ContentReviewer:
         else:
             return (1.0, None)
 
+    # Plain functions in the class body, so the table is built once at import time
+    quality_checks = MappingProxyType({
+        "length": _check_length,
+        "engagement": _check_engagement,
+        "technical_accuracy": _check_technical,
+        "readability": _check_readability
+    })
+
+def submit_batch(generator: DevOpsContentGenerator, event) -> Dict:
+    """Start a Batch API job for a queue of posts (50% token discount, results within 24h)"""
+    n_posts = int(event.get("n_posts", 7))
+    if not 0 < n_posts <= MAX_BATCH_POSTS:
+        raise ValueError(f"n_posts must be between 1 and {MAX_BATCH_POSTS}")
+    batch_id = generator.generate_batch(n_posts)
+    return {
+        'statusCode': 202,
+        'body': json.dumps({'message': 'Batch submitted', 'batch_id': batch_id})
+    }
+
+def collect_batch(generator: DevOpsContentGenerator, reviewer: ContentReviewer, event, ts: str) -> Dict:
+    """Review a finished batch and enqueue the approved posts for LinkedInPostAutomator"""
+    batch_id = event["batch_id"]
+    status, ideas = generator.fetch_batch_results(batch_id, ts)
+    if status != "completed":
+        return {
+            'statusCode': 202,
+            'body': json.dumps({'message': f'Batch {status}', 'batch_id': batch_id})
+        }
+
+    approved = []
+    for idea in ideas:
+        post = LinkedInPost(
+            content=idea["content"],
+            hashtags=idea["hashtags"],
+            post_type=idea["type"],
+            scheduled_time=ts
+        )
+        review = reviewer.review_post(post)
+        if review["approved"]:
+            approved.append(f"{idea['content']}\n\n{idea['hashtags']}")
+        else:
+            logger.warning("Batch post rejected - Issues: %s", review['issues'])
+
+    queue = get_post_queue()
+    if queue:
+        # Collecting is retried until it returns 200, so only the first successful call enqueues
+        if not queue.push_batch(batch_id, approved):
+            logger.info("Batch %s was already collected, nothing enqueued", batch_id)
+            return {
+                'statusCode': 200,
+                'body': json.dumps({'message': 'Batch already collected', 'batch_id': batch_id})
+            }
+    logger.info("Batch %s: %s of %s posts approved", batch_id, len(approved), len(ideas))
+    return {
+        'statusCode': 200,
+        'body': json.dumps({
+            'message': 'Batch collected',
+            'approved': len(approved),
+            'queued': bool(queue),
+            'posts': approved
+        })
+    }
+
 def lambda_handler(event, context):
     """
     Main Lambda handler for content generation
     Can be triggered by EventBridge, API Gateway, or manual invocation
     """
-    logger.info(f"Event received: {json.dumps(event)}")
+    logger.info("Event received: %s", event)
+    # One timestamp for the whole invocation, shared by the idea and the post
+    ts = datetime.now(timezone.utc).isoformat()
     
     try:
         # Initialize components
         generator = DevOpsContentGenerator()
         reviewer = ContentReviewer()
+
+        action = event.get("action") if isinstance(event, dict) else None
+        if action == "submit_batch":
+            return submit_batch(generator, event)
+        if action == "collect_batch":
+            return collect_batch(generator, reviewer, event, ts)
         
         # Generate content
-        idea = generator.generate_content_ideas()
+        idea = generator.generate_content_ideas(ts)
         
         # Create post object for review
         post = LinkedInPost(
             content=idea["content"],
             hashtags=idea["hashtags"],
             post_type=idea["type"],
-            scheduled_time=datetime.now().isoformat()
+            scheduled_time=ts
         )
         
         # Review the post
@@ -325,7 +875,7 @@ def lambda_handler(event, context):
         
         if review["approved"]:
             # Combine content with hashtags
-            full_content = f"{idea['content']}\n\n{' '.join(idea['hashtags'])}"
+            full_content = f"{idea['content']}\n\n{idea['hashtags']}"
             
             return {
                 'statusCode': 200,
@@ -339,10 +889,11 @@ def lambda_handler(event, context):
             }
         else:
             # Log rejected post
-            logger.warning(f"Post rejected - Issues: {review['issues']}")
+            logger.warning("Post rejected - Issues: %s", review['issues'])
             
+            # Not 200, so callers don't mistake the rejection body for a post
             return {
-                'statusCode': 200,
+                'statusCode': 422,
                 'body': json.dumps({
                     'message': 'Content generated but not approved',
                     'issues': review['issues'],
@@ -351,7 +902,7 @@ def lambda_handler(event, context):
             }
              
     except Exception as e:
-        logger.error(f"Error in lambda_handler: {str(e)}")
+        logger.error("Error in lambda_handler: %s", e)
         return {
             'statusCode': 500,
             'body': json.dumps({
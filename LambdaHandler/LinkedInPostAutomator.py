@@ -1,14 +1,38 @@
+import asyncio
+import hashlib
 import json
 import logging
 import os
-import boto3
-import urllib3
-from datetime import datetime
+from functools import lru_cache
+from datetime import datetime, timezone
+# Packaged into the same deployment zip, so content is generated in-process
+from DevOpsContentGenerator import lambda_handler as generate_content, get_post_queue, json_dumps, json_loads, aws_client_config
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Imported and built on first use, then reused across warm invocations
+@lru_cache(maxsize=None)
+def _http():
+    import urllib3
+    return urllib3.PoolManager(
+        num_pools=4,
+        maxsize=8,
+        # Only idempotent methods are retried; retrying ugcPosts could publish twice
+        retries=urllib3.Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+    )
+
+# userinfo is fixed for the lifetime of an access token, so warm containers reuse it.
+# Keyed by a token hash to keep the raw token out of the cache keys; a token that
+# is refused (e.g. missing the openid/profile scopes) is cached as None.
+_USER_INFO = {}
+
 class LinkedInAutomator:
     def __init__(self):
         # Get credentials from Parameter Store
@@ -31,25 +55,30 @@ class LinkedInAutomator:
     def get_user_info(self):
         """Fetch LinkedIn user information"""
         url = "https://api.linkedin.com/v2/userinfo"
-        http = urllib3.PoolManager()
+        token_hash = hashlib.sha256(self.access_token.encode('utf-8')).hexdigest()
+        if token_hash in _USER_INFO:
+            return _USER_INFO[token_hash]
         
         try:
-            response = http.request('GET', url, headers=self.headers)
+            response = _http().request('GET', url, headers=self.headers)
             if response.status == 200:
-                user_info = json.loads(response.data.decode('utf-8'))
+                user_info = json_loads(response.data)
                 logger.info("Fetched user info successfully")
+                _USER_INFO[token_hash] = user_info
                 return user_info
             else:
-                logger.error(f"Failed to fetch user info: {response.status}")
+                # Posting only needs w_member_social, so this isn't fatal to the run
+                logger.warning("Failed to fetch user info: %s", response.status)
+                if 400 <= response.status < 500 and response.status != 429:
+                    _USER_INFO[token_hash] = None
                 return None
         except Exception as e:
-            logger.error(f"Error fetching user info: {e}")
+            logger.error("Error fetching user info: %s", e)
             return None
 
     def post_on_linkedin(self, text_to_post: str):
         """Post content to LinkedIn"""
         url = 'https://api.linkedin.com/v2/ugcPosts'
-        http = urllib3.PoolManager()
         
         post_data = {
             "author": self.author_urn,
@@ -67,30 +96,39 @@ class LinkedInAutomator:
             }
         }
         
+        body = json_dumps(post_data)
         try:
-            response = http.request(
+            response = _http().request(
                 'POST',
                 url,
-                body=json.dumps(post_data).encode('utf-8'),
-                headers=self.headers
+                body=body,
+                # The ack is a few bytes of JSON, so skip the decompressor
+                headers={
+                    **self.headers,
+                    'Content-Length': str(len(body)),
+                    'Accept-Encoding': 'identity'
+                }
             )
             
             if response.status == 201:
                 logger.info("Post shared successfully on LinkedIn!")
-                response_data = json.loads(response.data.decode('utf-8'))
+                response_data = json_loads(response.data)
                 return True, response_data.get('id', 'unknown')
             else:
-                logger.error(f"Error posting to LinkedIn: {response.status} - {response.data}")
+                logger.error("Error posting to LinkedIn: %s - %s", response.status, response.data)
                 return False, None
                 
         except Exception as e:
-            logger.error(f"Failed to post on LinkedIn: {e}")
+            logger.error("Failed to post on LinkedIn: %s", e)
             return False, None
 
-def send_notification(success: bool, result: str, msg: str = None):
-    """Send SNS notification about posting status"""
-    sns = boto3.client("sns")
+@lru_cache(maxsize=None)
+def _sns_client():
+    import boto3
+    return boto3.client('sns', config=aws_client_config())
 
+def send_notification(success: bool, result: str, msg: str = None, timestamp: str = None):
+    """Send SNS notification about posting status"""
     TOPIC_ARN = os.environ.get('NOTIFICATION_SNS_TOPIC')
 
     if not TOPIC_ARN:
@@ -100,62 +138,88 @@ def send_notification(success: bool, result: str, msg: str = None):
         message = {
             "Post": result,
             "status": "success" if success else "failed",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp or datetime.now(timezone.utc).isoformat()
         }
         
         if msg:
             message["status"] = msg
         
-        sns.publish(
+        _sns_client().publish(
             TopicArn=TOPIC_ARN,
-            Message=json.dumps(message),
+            Message=json_dumps(message).decode('utf-8'),
             Subject=f"LinkedIn Post {'Successful' if success else 'Failed'}"
         )
-        logger.info(f"Notification sent for post")
+        logger.info("Notification sent for post")
     except Exception as e:
-        logger.error(f"Error sending notification: {e}")
+        logger.error("Error sending notification: %s", e)
+
+def next_post(event, context) -> dict:
+    """Take the oldest post from the batch queue if one is configured, else generate one"""
+    queue = get_post_queue()
+    queued = queue.pop() if queue else None
+    if queued:
+        logger.info("Using queued post from batch generation")
+        # The claimed item rides along so a failed publish can put it back
+        return {'statusCode': 200, 'body': queued["content"], 'queue_item': queued}
+    return generate_content(event, context)
+
+async def generate_and_warm_up(automator: LinkedInAutomator, event, context):
+    """
+    Run content generation and, if LINKEDIN_WARMUP is enabled, the LinkedIn
+    userinfo call concurrently. On a cold container the userinfo call validates
+    the token and opens the pooled connection to api.linkedin.com while the
+    generator is still working; warm containers answer it from the per-token cache.
+    """
+    # Opt-in: /v2/userinfo needs the openid and profile scopes, posting doesn't
+    if os.environ.get('LINKEDIN_WARMUP', '').lower() != 'true':
+        return await asyncio.to_thread(next_post, event, context)
+    content, _ = await asyncio.gather(
+        asyncio.to_thread(next_post, event, context),
+        asyncio.to_thread(automator.get_user_info)
+    )
+    return content
 
 def lambda_handler(event, context):
     """
     Lambda handler for posting to LinkedIn
     Expects event from SNS with content and post_id
     """
-    logger.info(f"Event received: {json.dumps(event)}")
+    logger.info("Event received: %s", event)
+    ts = datetime.now(timezone.utc).isoformat()
     
     try:
-        
-        lambda_client = boto3.client('lambda')
-
         # Initialize LinkedIn automator
         automator = LinkedInAutomator()
         
-        response = lambda_client.invoke(
-            FunctionName='DevOpsContentGenerator',  # ARN or name
-            InvocationType='RequestResponse',        # sync call
-            Payload=json.dumps(event),
-        )
-        logger.info(f"Response received from DevOpsContentGenerator: {response}")
-        # Get response payload
-        content = json.loads(response['Payload'].read())
-        logger.info(f"type: {type(content['body'])}")
-        logger.info(f"Content received from DevOpsContentGenerator: {content}")
+        content = asyncio.run(generate_and_warm_up(automator, event, context))
+        logger.info("Content received from DevOpsContentGenerator: %s", content)
+        if content.get("statusCode") != 200:
+            # Rejected or failed generation: the body is an error report, not a post
+            send_notification(False, content.get("body"), "No approved content to post", ts)
+            return {
+                'statusCode': content.get("statusCode", 500),
+                'body': content.get("body")
+            }
         # Post to LinkedIn
-        result = automator.post_on_linkedin(content["body"])
+        success, post_id = automator.post_on_linkedin(content["body"])
         
-        if result:
+        if success:
             # Send success notification
-            send_notification(True, result, "Posted successfully to LinkedIn")
+            send_notification(True, post_id, "Posted successfully to LinkedIn", ts)
             
             return {
                 'statusCode': 200,
                 'body': json.dumps({
                     'message': 'Successfully posted to LinkedIn',
-                    'LinkedIn_post': result
+                    'LinkedIn_post': post_id
                 })
             }
         else:
+            if content.get("queue_item"):
+                # Not published, so the queued post goes back rather than being lost
+                get_post_queue().requeue(content["queue_item"])
             # Send failure notification
-            send_notification(False, result, "Failed to post to LinkedIn")
+            send_notification(False, post_id, "Failed to post to LinkedIn", ts)
             
             return {
                 'statusCode': 500,
@@ -165,10 +229,10 @@ def lambda_handler(event, context):
             }
             
     except Exception as e:
-        logger.error(f"Error in lambda_handler: {str(e)}")
+        logger.error("Error in lambda_handler: %s", e)
         
         # Send error notification
-        send_notification(False, str(e), "Error occurred in LinkedInPostAutomator")
+        send_notification(False, str(e), "Error occurred in LinkedInPostAutomator", ts)
         
         return {
             'statusCode': 500,